@@ -3,6 +3,7 @@ Base classes for diseases
 """
 
 import numpy as np
+import numba as nb
 import sciris as sc
 import starsim as ss
 import networkx as nx
@@ -132,8 +133,10 @@ class Disease(ss.Module):
         modules, where relevant.
         """
         sim = self.sim
+        auids = sim.people.auids
+        alive = sim.people.alive.raw[auids] # Gather once and reuse for each state, rather than building a BoolArr per state
         for state in self._boolean_states:
-            self.results[f'n_{state.name}'][sim.ti] = np.count_nonzero(state & sim.people.alive)
+            self.results[f'n_{state.name}'][sim.ti] = np.count_nonzero(state.raw[auids] & alive)
         return
 
 
@@ -261,15 +264,21 @@ class Infection(Disease):
         networks = []
         betamap = self._check_betas()
 
+        # These don't depend on the network, so only calculate them once
+        rel_trans = self.rel_trans.asnew(self.infectious * self.rel_trans).raw
+        rel_sus   = self.rel_sus.asnew(self.susceptible * self.rel_sus).raw
+
+        # With no one infectious there can be no transmission, so skip drawing random numbers. The RNGs
+        # jump to a fixed state at the start of each timestep, so this doesn't affect later draws.
+        no_sources = not ss.options._centralized and not self.infectious.any()
+
         for i, (nkey,net) in enumerate(self.sim.networks.items()):
-            if not len(net):
+            if not len(net) or no_sources:
                 break
 
             nbetas = betamap[nkey]
             edges = net.edges
 
-            rel_trans = self.rel_trans.asnew(self.infectious * self.rel_trans)
-            rel_sus   = self.rel_sus.asnew(self.susceptible * self.rel_sus)
             p1p2b0 = [edges.p1, edges.p2, nbetas[0]]
             p2p1b1 = [edges.p2, edges.p1, nbetas[1]]
             for src, trg, beta in [p1p2b0, p2p1b1]:
@@ -278,15 +287,24 @@ class Infection(Disease):
                 if beta == 0:
                     continue
 
-                # Calculate probability of a->b transmission.
-                beta_per_dt = net.beta_per_dt(disease_beta=beta, dt=self.sim.dt)
-                p_transmit = rel_trans[src] * rel_sus[trg] * beta_per_dt
+                # Calculate probability of a->b transmission, in a single pass over the edges
+                beta_per_dt = np.broadcast_to(net.beta_per_dt(disease_beta=beta, dt=self.sim.dt), len(src))
+                p_transmit = np.empty(len(src), dtype=np.result_type(rel_trans, rel_sus, beta_per_dt))
+                _trans_probs(rel_trans, rel_sus, src, trg, beta_per_dt, p_transmit)
+
+                # Only edges with a nonzero probability can transmit, so skip the rest. Random numbers
+                # are drawn per slot and the RNG jumps after each call, so this doesn't change them.
+                inds = np.flatnonzero(p_transmit > 0)
+                if 0 < len(inds) < len(src) and not ss.options._centralized:
+                    src = src[inds]
+                    trg = trg[inds]
+                    p_transmit = p_transmit[inds]
 
                 # Generate a new random number based on the two other random numbers
                 rvs_s = self.rng_source.rvs(src)
                 rvs_t = self.rng_target.rvs(trg)
                 rvs = ss.combine_rands(rvs_s, rvs_t)
-                
+
                 new_cases_bool = rvs < p_transmit
                 new_cases.append(trg[new_cases_bool])
                 sources.append(src[new_cases_bool])
@@ -331,6 +349,14 @@ class Infection(Disease):
         return
 
 
+@nb.njit(cache=True)
+def _trans_probs(rel_trans, rel_sus, src, trg, beta_per_dt, out):  # pragma: no cover
+    """ Equivalent to out[:] = rel_trans[src] * rel_sus[trg] * beta_per_dt, without the temporary arrays """
+    for i in range(len(src)):
+        out[i] = rel_trans[src[i]] * rel_sus[trg[i]] * beta_per_dt[i]
+    return
+
+
 class InfectionLog(nx.MultiDiGraph):
     """
     Record infections
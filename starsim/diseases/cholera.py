@@ -143,14 +143,12 @@ class Cholera(ss.Infection):
         self.ti_infected[uids] = ti + p.dur_exp2inf.rvs(uids) / dt
 
         # Determine who becomes symptomatic and when
-        symp_uids = p.p_symp.filter(uids)
+        symp_uids, asymp_uids = p.p_symp.split(uids)
         self.ti_symptomatic[symp_uids] = self.ti_infected[symp_uids]
 
         # Determine who dies and when
-        dead_uids = p.p_death.filter(symp_uids)
+        dead_uids, symp_rev_uids = p.p_death.split(symp_uids)
         self.ti_dead[dead_uids] = self.ti_symptomatic[dead_uids] + p.dur_symp2dead.rvs(dead_uids) / dt
-        symp_rev_uids = np.setdiff1d(symp_uids, dead_uids)
-        asymp_uids = np.setdiff1d(uids, symp_uids)
 
         # Determine when agents recover
         self.ti_recovered[symp_rev_uids] = self.ti_exposed[symp_rev_uids] + p.dur_symp2rec.rvs(symp_rev_uids) / dt
@@ -4,7 +4,6 @@ Adapted from https://github.com/optimamodel/gavi-outbreaks/blob/main/stisim/gavi
 Original version by@domdelport and @RomeshA
 """
 
-import numpy as np
 import starsim as ss
 from starsim.diseases.sir import SIR
 
@@ -107,20 +106,17 @@ class Ebola(SIR):
         self.ti_infected[uids] = ti + p.dur_exp2symp.rvs(uids) / dt
 
         # Determine who progresses to sever and when
-        sev_uids = p.p_sev.filter(uids)
+        sev_uids, rec_symp_uids = p.p_sev.split(uids)
         self.ti_severe[sev_uids] = self.ti_infected[sev_uids] + p.dur_symp2sev.rvs(sev_uids) / dt
 
         # Determine who dies and who recovers and when
-        dead_uids = p.p_death.filter(sev_uids)
+        dead_uids, rec_sev_uids = p.p_death.split(sev_uids)
         self.ti_dead[dead_uids] = self.ti_severe[dead_uids] + p.dur_sev2dead.rvs(dead_uids) / dt
-        rec_sev_uids = np.setdiff1d(sev_uids, dead_uids)
         self.ti_recovered[rec_sev_uids] = self.ti_severe[rec_sev_uids] + p.dur_sev2rec.rvs(rec_sev_uids) / dt
-        rec_symp_uids = np.setdiff1d(uids, sev_uids)
         self.ti_recovered[rec_symp_uids] = self.ti_infected[rec_symp_uids] + p.dur_symp2rec.rvs(rec_symp_uids) / dt
 
         # Determine time of burial - either immediate (safe burials) or after a delay (unsafe)
-        safe_buried = p.p_safe_bury.filter(dead_uids)
-        unsafe_buried = np.setdiff1d(dead_uids, safe_buried)
+        safe_buried, unsafe_buried = p.p_safe_bury.split(dead_uids)
         self.ti_buried[safe_buried] = self.ti_dead[safe_buried]
         self.ti_buried[unsafe_buried] = self.ti_dead[unsafe_buried] + p.dur_dead2buried.rvs(unsafe_buried) / dt
 
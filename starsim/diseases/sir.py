@@ -3,6 +3,7 @@ Define SIR and SIS disease modules
 """
 
 import numpy as np
+import numba as nb
 import sciris as sc
 import matplotlib.pyplot as pl
 import starsim as ss
@@ -10,6 +11,72 @@ import starsim as ss
 
 __all__ = ['SIR', 'SIS']
 
+
+@nb.njit(cache=True)
+def _sir_progress(auids, infected, recovered, ti_recovered, ti_dead, ti, out_dead):  # pragma: no cover
+    """
+    Single pass over the active agents for SIR.update_pre(): flip infected ->
+    recovered in place, and write the UIDs of agents who are due to die into
+    the preallocated output buffer. Returns the number of deaths.
+
+    The loop is serial so that the output UIDs stay in sorted order, matching
+    what ``BoolArr.uids`` would return.
+    """
+    n_dead = 0
+    for i in range(len(auids)):
+        uid = auids[i]
+        if infected[uid] and ti_recovered[uid] <= ti:
+            infected[uid] = False
+            recovered[uid] = True
+        if ti_dead[uid] <= ti:
+            out_dead[n_dead] = uid
+            n_dead += 1
+    return n_dead
+
+
+@nb.njit(cache=True)
+def _split_inds(mask, true_inds, false_inds):  # pragma: no cover
+    """ Write the indices of true and false entries of a mask into the presized output arrays, in one pass """
+    i_true = 0
+    i_false = 0
+    for i in range(len(mask)):
+        if mask[i]:
+            true_inds[i_true] = i
+            i_true += 1
+        else:
+            false_inds[i_false] = i
+            i_false += 1
+    return
+
+
+@nb.njit(cache=True)
+def _sir_clear(uids, susceptible, infected, recovered):  # pragma: no cover
+    """ Clear all three SIR flags for the given UIDs in a single pass; used by SIR.update_death() """
+    for i in range(len(uids)):
+        uid = uids[i]
+        susceptible[uid] = False
+        infected[uid] = False
+        recovered[uid] = False
+    return
+
+
+@nb.njit(cache=True)
+def _sis_wane(auids, immunity, rel_sus, factor):  # pragma: no cover
+    """
+    Single pass over the active agents for SIS.update_immunity(): wane the
+    immunity of agents who have any, and update their relative susceptibility
+    in place.
+    """
+    for k in range(len(auids)):
+        uid = auids[k]
+        imm = immunity[uid]
+        if imm > 0:
+            imm *= factor
+            immunity[uid] = imm
+            rel_sus[uid] = max(0.0, 1.0 - imm)
+    return
+
+
 class SIR(ss.Infection):
     """
     Example SIR model
@@ -36,46 +103,55 @@ class SIR(ss.Infection):
         return
 
     def update_pre(self):
-        # Progress infectious -> recovered
+        # Progress infectious -> recovered, and find who is due to die, in one pass
         sim = self.sim
-        recovered = (self.infected & (self.ti_recovered <= sim.ti)).uids
-        self.infected[recovered] = False
-        self.recovered[recovered] = True
+        auids = sim.people.auids
+        out_dead = np.empty(len(auids), dtype=ss.dtypes.int)
+        n_dead = _sir_progress(auids, self.infected.raw, self.recovered.raw, self.ti_recovered.raw,
+                               self.ti_dead.raw, sim.ti, out_dead)
 
         # Trigger deaths
-        deaths = (self.ti_dead <= sim.ti).uids
-        if len(deaths):
+        if n_dead:
+            deaths = out_dead[:n_dead].view(ss.uids)
             sim.people.request_death(deaths)
         return
 
     def set_prognoses(self, uids, source_uids=None):
         """ Set prognoses """
         super().set_prognoses(uids, source_uids)
-        ti = self.sim.ti
-        dt = self.sim.dt
-        self.susceptible[uids] = False
-        self.infected[uids] = True
-        self.ti_infected[uids] = ti
-
+        sim = self.sim
+        ti = sim.ti
+        dt = sim.dt
         p = self.pars
+        self.susceptible.raw[uids] = False # Write to the raw arrays directly since these are UIDs
+        self.infected.raw[uids] = True
+        self.ti_infected.raw[uids] = ti
 
         # Sample duration of infection, being careful to only sample from the
         # distribution once per timestep.
         dur_inf = p.dur_inf.rvs(uids)
 
         # Determine who dies and who recovers and when
-        will_die = p.p_death.rvs(uids)
-        dead_uids = uids[will_die]
-        rec_uids = uids[~will_die]
-        self.ti_dead[dead_uids] = ti + dur_inf[will_die] / dt # Consider rand round, but not CRN safe
-        self.ti_recovered[rec_uids] = ti + dur_inf[~will_die] / dt
+        ti_end = ti + dur_inf / dt # Consider rand round, but not CRN safe
+        p_death = p.p_death.pars.get('p') if isinstance(p.p_death, ss.bernoulli) else None
+        if sc.isnumber(p_death) and p_death in [0, 1] and not ss.options._centralized: # Outcome is certain, so skip sampling (unless centralized, where the draw advances the shared stream)
+            if p_death == 0:
+                self.ti_recovered.raw[uids] = ti_end
+            else:
+                self.ti_dead.raw[uids] = ti_end
+        else:
+            will_die = p.p_death.rvs(uids)
+            n_dead = np.count_nonzero(will_die)
+            dead = np.empty(n_dead, dtype=ss.dtypes.int)
+            rec = np.empty(len(will_die) - n_dead, dtype=ss.dtypes.int)
+            _split_inds(will_die, dead, rec) # Split into index vectors in one pass, rather than gathering with boolean masks
+            self.ti_dead.raw[uids[dead]] = ti_end[dead]
+            self.ti_recovered.raw[uids[rec]] = ti_end[rec]
         return
 
     def update_death(self, uids):
         """ Reset infected/recovered flags for dead agents """
-        self.susceptible[uids] = False
-        self.infected[uids] = False
-        self.recovered[uids] = False
+        _sir_clear(uids, self.susceptible.raw, self.infected.raw, self.recovered.raw)
         return
 
     def plot(self, plot_kw=None):
@@ -119,31 +195,36 @@ class SIS(ss.Infection):
 
     def update_pre(self):
         """ Progress infectious -> recovered """
-        recovered = (self.infected & (self.ti_recovered <= self.sim.ti)).uids
-        self.infected[recovered] = False
-        self.susceptible[recovered] = True
+        auids = self.sim.people.auids
+        recovering = self.ti_recovered.raw[auids] <= self.sim.ti
+        recovering &= self.infected.raw[auids] # In place, to avoid a further temporary array
+        recovered = auids[np.flatnonzero(recovering)]
+        self.infected.raw[recovered] = False
+        self.susceptible.raw[recovered] = True
         self.update_immunity()
         return
     
     def update_immunity(self):
-        has_imm = (self.immunity > 0).uids
-        self.immunity[has_imm] = (self.immunity[has_imm])*(1 - self.pars.waning*self.sim.dt)
-        self.rel_sus[has_imm] = np.maximum(0, 1 - self.immunity[has_imm])
+        factor = 1 - self.pars.waning*self.sim.dt
+        _sis_wane(self.sim.people.auids, self.immunity.raw, self.rel_sus.raw, factor)
         return
 
     def set_prognoses(self, uids, source_uids=None):
         """ Set prognoses """
         super().set_prognoses(uids, source_uids)
-        self.susceptible[uids] = False
-        self.infected[uids] = True
-        self.ti_infected[uids] = self.sim.ti
-        self.immunity[uids] += self.pars.imm_boost
+        sim = self.sim
+        ti = sim.ti
+        p = self.pars
+        self.susceptible.raw[uids] = False
+        self.infected.raw[uids] = True
+        self.ti_infected.raw[uids] = ti
+        self.immunity.raw[uids] += p.imm_boost
 
         # Sample duration of infection
-        dur_inf = self.pars.dur_inf.rvs(uids)
+        dur_inf = p.dur_inf.rvs(uids)
 
         # Determine when people recover
-        self.ti_recovered[uids] = self.sim.ti + dur_inf / self.sim.dt
+        self.ti_recovered.raw[uids] = ti + dur_inf / sim.dt
 
         return
     
@@ -130,6 +130,14 @@ class Dists(sc.prettyobj):
             out += dist.jump(to=to, delta=delta)
         return out
 
+    def _defer_jump(self, to=None, delta=1):
+        """ Like jump(), but each jump is only applied when that RNG is next used; returns nothing """
+        if ss.options._centralized:
+            return
+        for dist in self.dists.values():
+            dist._defer_jump(to=to, delta=delta)
+        return
+
     def reset(self):
         """ Reset each RNG """
         out = sc.autolist()
@@ -199,7 +207,7 @@ class Dist:
         self._slots = None # Internal variable to track currently-in-use slots
         
         # History and random state
-        self.rng = None # The actual RNG generator for generating random numbers
+        self.rng = None # The actual RNG generator for generating random numbers; also clears any deferred jump
         self.trace = None # The path of this object within the parent
         self.ind = 0 # The index of the RNG (usually updated on each timestep)
         self.called = 0 # The number of times the distribution has been called
@@ -268,6 +276,22 @@ class Dist:
             self.process_pars(call=False)
         return
 
+    @property
+    def rng(self):
+        """ The random number generator, after applying any deferred jump """
+        if self._jump_to is not None:
+            jumps, self._jump_to = self._jump_to, None
+            self.reset() # As in jump(), start from the initial state
+            if jumps:
+                self.bitgen.state = self.bitgen.jumped(jumps=jumps).state
+        return self._rng
+    
+    @rng.setter
+    def rng(self, rng):
+        self._rng = rng
+        self._jump_to = None # The number of jumps still to be applied, if _defer_jump() was used
+        return
+    
     @property
     def bitgen(self):
         try:    return self.rng._bit_generator
@@ -317,6 +341,7 @@ class Dist:
         """
         if not isinstance(state, dict):
             state = self.history[state]
+        self._jump_to = None # Any deferred jump is superseded by the restored state
         self.rng._bit_generator.state = state.copy()
         self.ready = True
         return self.state
@@ -335,6 +360,23 @@ class Dist:
             self.bitgen.state = self.bitgen.jumped(jumps=jumps).state # Now take "jumps" number of jumps
         return self.state
     
+    def _defer_jump(self, to=None, delta=1):
+        """
+        Like jump(), but only record the target and apply the jump the next time
+        the RNG is used
+        
+        This gives the same random numbers, but skips the work for distributions
+        that are not sampled on this timestep. Nothing is returned, since the
+        jumped state is not computed until then.
+        """
+        if ss.options._centralized:
+            return
+        jumps = to if (to is not None) else self.ind + delta
+        self.ind = jumps
+        self._jump_to = jumps
+        self.ready = True
+        return
+    
     def initialize(self, trace=None, seed=None, module=None, sim=None, slots=None, force=False):
         """ Calculate the starting seed and create the RNG """
         
@@ -690,6 +732,7 @@ class lognorm_ex(Dist):
         ss.lognorm_ex(mean=2, stdev=1, strict=False).rvs(1000).mean() # Should be close to 2
     """
     def __init__(self, mean=1.0, stdev=1.0, **kwargs):
+        self._im_cache = None # The most recent scalar (mean, stdev, mean_im, sigma_im); set first since initialization may need it
         super().__init__(distname='lognormal', dist=sps.lognorm, mean=mean, stdev=stdev, **kwargs)
         return
     
@@ -705,13 +748,20 @@ class lognorm_ex(Dist):
         p = self._pars
         mean = p.pop('mean')
         stdev = p.pop('stdev')
-        if np.isscalar(mean) and mean <= 0:
-            errormsg = f'Cannot create a lognorm_ex distribution with mean≤0 (mean={mean}); did you mean to use lognorm_im instead?'
-            raise ValueError(errormsg)
-        std2 = stdev**2
-        mean2 = mean**2
-        sigma_im = np.sqrt(np.log(std2/mean2 + 1)) # Computes stdev for the underlying normal distribution
-        mean_im  = np.log(mean2 / np.sqrt(std2 + mean2)) # Computes the mean of the underlying normal distribution
+        scalar = np.isscalar(mean) and np.isscalar(stdev)
+        cache = self._im_cache
+        if scalar and cache is not None and cache[0] == mean and cache[1] == stdev: # Parameters are usually fixed, so skip the conversion
+            mean_im, sigma_im = cache[2], cache[3]
+        else:
+            if np.isscalar(mean) and mean <= 0:
+                errormsg = f'Cannot create a lognorm_ex distribution with mean≤0 (mean={mean}); did you mean to use lognorm_im instead?'
+                raise ValueError(errormsg)
+            std2 = stdev**2
+            mean2 = mean**2
+            sigma_im = np.sqrt(np.log(std2/mean2 + 1)) # Computes stdev for the underlying normal distribution
+            mean_im  = np.log(mean2 / np.sqrt(std2 + mean2)) # Computes the mean of the underlying normal distribution
+            if scalar:
+                self._im_cache = (mean, stdev, mean_im, sigma_im)
         p.mean = mean_im
         p.sigma = sigma_im
         return mean_im, sigma_im
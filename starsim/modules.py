@@ -2,6 +2,7 @@
 General module class -- base class for diseases, interventions, etc.
 """
 
+import numpy as np
 import sciris as sc
 import starsim as ss
 
@@ -49,6 +50,7 @@ class Module(sc.quickobj):
         self.results = ss.Results(self.name)
         self.initialized = False
         self.finalized = False
+        self._states_cache = None # Populated in init_pre(), once the states are fixed
         return
     
     def __bool__(self):
@@ -57,9 +59,9 @@ class Module(sc.quickobj):
     
     def set_metadata(self, name, label, requires):
         """ Set metadata for the module """
-        self.name = sc.ifelse(name, getattr(self, 'name', self.__class__.__name__.lower())) # Default name is the class name
-        self.label = sc.ifelse(label, getattr(self, 'label', self.name))
-        self.requires = sc.mergelists(requires)
+        self.name = name if name is not None else getattr(self, 'name', self.__class__.__name__.lower()) # Default name is the class name
+        self.label = label if label is not None else getattr(self, 'label', self.name)
+        self.requires = [] if requires is None else sc.mergelists(requires) # Skip the helper in the usual case of no requirements
         return
     
     def default_pars(self, inherit=True, **kwargs):
@@ -121,6 +123,7 @@ class Module(sc.quickobj):
         sim.pars[self.name] = self.pars
         sim.results[self.name] = self.results
         sim.people.add_module(self) # Connect the states to the people
+        self._states_cache = self.states # States are now linked to People, so any added later would not be grown; cache them
         return
     
     def init_post(self):
@@ -146,10 +149,14 @@ class Module(sc.quickobj):
 
     def finalize_results(self):
         """ Finalize results """
-        # Scale results
+        # Scale results, in place where the dtype is unchanged
         for reskey, res in self.results.items():
             if isinstance(res, ss.Result) and res.scale:
-                self.results[reskey] = self.results[reskey]*self.sim.pars.pop_scale
+                scale = self.sim.pars.pop_scale
+                if np.result_type(res, scale) == res.dtype:
+                    res *= scale
+                else:
+                    self.results[reskey] = res*scale
         return
     
     def add_states(self, *args, check=True):
@@ -184,8 +191,14 @@ class Module(sc.quickobj):
         within a list of states, or otherwise in some other nested structure - perhaps
         due to supporting features like multiple genotypes) then the Module should
         overload this attribute to ensure that all states appear in here.
+        
+        Once the module has been initialized, the list is cached rather than rebuilt
+        on each access.
         """
-        return [x for x in self.__dict__.values() if isinstance(x, ss.Arr)] # TODO: use ndict
+        states = self.__dict__.get('_states_cache')
+        if states is None:
+            states = [x for x in self.__dict__.values() if isinstance(x, ss.Arr)] # TODO: use ndict
+        return states
 
     @property
     def statesdict(self): # TODO: remove
@@ -277,10 +277,12 @@ class Network(ss.Module):
             inds = np.array(inds, dtype=np.int64)
 
         # Find the contacts
-        contact_inds = ss.find_contacts(self.edges.p1, self.edges.p2, inds)
+        contact_inds = ss.find_contacts(self.edges.p1, self.edges.p2, inds, as_array=True)
         if as_array:
-            contact_inds = np.fromiter(contact_inds, dtype=ss_int_)
+            contact_inds = contact_inds.astype(ss_int_, copy=False)
             contact_inds.sort()
+        else:
+            contact_inds = set(contact_inds.tolist())
 
         return contact_inds
 
@@ -48,8 +48,11 @@ class People(sc.prettyobj):
         # Handle the three fundamental arrays: UIDs for tracking agents, slots for 
         # tracking random numbers, and AUIDs for tracking alive agents
         n = int(n_agents)
-        uids = ss.uids(np.arange(n))
-        self.auids = uids.copy() # This tracks all active UIDs (in practice, agents who are alive)
+        uids = np.arange(n, dtype=ss.dtypes.int).view(ss.uids) # View rather than ss.uids(), which would copy
+        self._auids_buf = uids.copy() # Backing storage for auids, with spare capacity so that grow() doesn't reallocate every time
+        self.auids = self._auids_buf[:n] # This tracks all active UIDs (in practice, agents who are alive)
+        self._n_alive = n # Running count of alive agents, updated in grow() and resolve_deaths()
+        self._new_deaths = 0 # Number of deaths resolved on the current timestep
         self.uid = ss.IndexArr('uid')  # This variable tracks all UIDs
         self.slot = ss.IndexArr('slot') # A slot is a special state managed internally
         self.uid.grow(new_vals=uids)
@@ -220,7 +223,7 @@ class People(sc.prettyobj):
 
         start_uid = self.uid.len_used
         stop_uid = start_uid + n
-        new_uids = ss.uids(np.arange(start_uid, stop_uid))
+        new_uids = np.arange(start_uid, stop_uid, dtype=ss.dtypes.int).view(ss.uids)
         self.uid.grow(new_uids, new_vals=new_uids)
 
         # We need to grow the slots as well
@@ -231,8 +234,16 @@ class People(sc.prettyobj):
         for state in self._states.values():
             state.grow(new_uids)
             
-        # Finally, update the alive indices
-        self.auids = self.auids.concat(new_uids)
+        # Finally, update the alive indices, growing the buffer geometrically if needed
+        n_active = len(self.auids)
+        n_total = n_active + n
+        if n_total > len(self._auids_buf):
+            new_buf = np.empty(max(n_total, 2*len(self._auids_buf)), dtype=ss.dtypes.int).view(ss.uids)
+            new_buf[:n_active] = self.auids
+            self._auids_buf = new_buf
+        self._auids_buf[n_active:n_total] = new_uids
+        self.auids = self._auids_buf[:n_total]
+        self._n_alive += n
         return new_uids
 
     def __getitem__(self, key):
@@ -250,7 +261,7 @@ class People(sc.prettyobj):
         return setattr(self, key, value)
 
     def __iter__(self):
-        """ Iterate over people """
+        """ Iterate over people; note that this creates a Person for each agent, so use to_df() for bulk access """
         for i in range(len(self)):
             yield self[i]
 
@@ -311,7 +322,11 @@ class People(sc.prettyobj):
 
     def resolve_deaths(self):
         """ Carry out any deaths that took place this timestep """
-        death_uids = (self.ti_dead <= self.sim.ti).uids
+        auids = self.auids
+        ti = self.sim.ti
+        death_uids = auids[np.flatnonzero(self.ti_dead.raw[auids] <= ti)]
+        self._n_alive -= np.count_nonzero(self.alive.raw[death_uids])
+        self._new_deaths = np.count_nonzero(self.ti_dead.raw[death_uids] == ti)
         self.alive[death_uids] = False
         return death_uids
     
@@ -319,15 +334,23 @@ class People(sc.prettyobj):
         """
         Remove dead agents
         """
-        uids = self.dead.uids
+        auids = self.auids
+        alive = self.alive.raw[auids]
+        uids = auids[np.flatnonzero(~alive)] # Equivalent to self.dead.uids, without the intermediate BoolArr
         if len(uids):
             
             # Remove the UIDs from the networks too
             for network in self.sim.networks.values():
                 network.remove_uids(uids) # TODO: only run once every nth timestep
                 
-            # Calculate the indices to keep
-            self.auids = self.auids[np.isin(self.auids, np.unique(uids), assume_unique=True, invert=True, kind='sort')]
+            # The indices to keep are the complement of the dead ones, so reuse the mask rather than a sort-based set difference.
+            # They go into a new buffer (with the same spare capacity for grow()), since earlier auids may still be views of the old one
+            keep = np.flatnonzero(alive)
+            n_keep = len(keep)
+            new_buf = np.empty(len(self._auids_buf), dtype=ss.dtypes.int).view(ss.uids)
+            np.take(auids, keep, out=new_buf[:n_keep])
+            self._auids_buf = new_buf
+            self.auids = new_buf[:n_keep]
 
         return
     
@@ -344,11 +367,21 @@ class People(sc.prettyobj):
     def update_results(self):
         ti = self.sim.ti
         res = self.sim.results
-        res.n_alive[ti] = np.count_nonzero(self.alive)
-        res.new_deaths[ti] = np.count_nonzero(self.ti_dead == ti)
-        res.cum_deaths[ti] = np.sum(res.new_deaths[:ti]) # TODO: inefficient to compute the cumulative sum on every timestep!
+        res.n_alive[ti] = self._n_alive
+        res.new_deaths[ti] = self._new_deaths
+        if ti > 0: # Running sum of deaths up to (but not including) this timestep
+            res.cum_deaths[ti] = res.cum_deaths[ti-1] + res.new_deaths[ti-1]
         return
     
+    def to_df(self):
+        """ Export the states of the active agents to a dataframe, with one row per agent """
+        auids = self.auids
+        data = {'uid': auids.to_numpy(), 'slot': self.slot.raw[auids].to_numpy()}
+        for key, state in self.states.items():
+            data[key] = state.raw[auids]
+        df = sc.dataframe(data)
+        return df
+    
     def person(self, ind):
         """ Get all the properties for a single person """
         person = Person()
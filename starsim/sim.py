@@ -3,6 +3,7 @@ Define core Sim classes
 """
 
 # Imports
+import re
 import itertools
 import numpy as np
 import sciris as sc
@@ -115,7 +116,7 @@ class Sim:
         
         # Initialize the results
         self.init_results()
-
+        
         # It's initialized
         self.initialized = True
         return self
@@ -204,50 +205,50 @@ class Sim:
             raise AlreadyRunError('Simulation already complete (call sim.initialize() to re-run)')
 
         # Advance random number generators forward to prepare for any random number calls that may be necessary on this step
-        self.dists.jump(to=self.ti+1)  # +1 offset because ti=0 is used on initialization
+        self.dists._defer_jump(to=self.ti+1)  # +1 offset because ti=0 is used on initialization; jumps are applied when each dist is next used
 
         # Update demographic modules (create new agents from births/immigration, schedule non-disease deaths and emigration)
-        for dem_mod in self.demographics():
+        for dem_mod in self.demographics.values():
             dem_mod.update()
 
         # Carry out autonomous state changes in the disease modules. This allows autonomous state changes/initializations
         # to be applied to newly created agents
-        for disease in self.diseases():
+        for disease in self.diseases.values():
             disease.update_pre()
 
         # Update connectors -- TBC where this appears in the ordering
-        for connector in self.connectors():
+        for connector in self.connectors.values():
             connector.update()
 
         # Update networks - this takes place here in case autonomous state changes at this timestep affect eligibility for contacts
-        for network in self.networks():
+        for network in self.networks.values():
             network.update()
 
         # Apply interventions - new changes to contacts will be visible and so the final networks can be customized by
         # interventions, by running them at this point
-        for intervention in self.interventions():
+        for intervention in self.interventions.values():
             intervention(self)
 
         # Carry out transmission/new cases
-        for disease in self.diseases():
+        for disease in self.diseases.values():
             disease.make_new_cases()
 
         # Execute deaths that took place this timestep (i.e., changing the `alive` state of the agents). This is executed
         # before analyzers have run so that analyzers are able to inspect and record outcomes for agents that died this timestep
         uids = self.people.resolve_deaths()
-        for disease in self.diseases():
+        for disease in self.diseases.values():
             disease.update_death(uids)
 
         # Update results
         self.people.update_results()
 
-        for dem_mod in self.demographics():
+        for dem_mod in self.demographics.values():
             dem_mod.update_results()
 
-        for disease in self.diseases():
+        for disease in self.diseases.values():
             disease.update_results()
 
-        for analyzer in self.analyzers():
+        for analyzer in self.analyzers.values():
             analyzer(self)
             
         # Clean up dead agents
@@ -270,7 +271,6 @@ class Sim:
         T = sc.timer()
         if not self.initialized:
             self.initialize()
-            self._orig_pars = sc.dcp(self.pars)  # Create a copy of the parameters to restore after the run
 
         if verbose is None:
             verbose = self.pars.verbose
@@ -288,25 +288,25 @@ class Sim:
             raise AlreadyRunError(errormsg)
 
         # Main simulation loop
+        simlabel = f'"{self.label}": ' if self.label else ''
+        progress_every = int(1.0 / verbose) if 0 < verbose < 2 else 1
         while self.ti < until:
 
-            # Check if we were asked to stop
-            elapsed = T.toc(output=True)
-
-            # Print progress
+            # Print progress; skipped entirely if not verbose, since it requires timing and string formatting
             if verbose:
-                simlabel = f'"{self.label}": ' if self.label else ''
+                elapsed = T.toc(output=True)
                 string = f'  Running {simlabel}{self.yearvec[self.ti]:0.1f} ({self.ti:2.0f}/{self.npts}) ({elapsed:0.2f} s) '
                 if verbose >= 2:
                     sc.heading(string)
                 elif verbose > 0:
-                    if not (self.ti % int(1.0 / verbose)):
+                    if not (self.ti % progress_every):
                         sc.progressbar(self.ti + 1, self.npts, label=string, length=20, newline=True)
 
             # Actually run the model
             self.step()
 
         # If simulation reached the end, finalize the results
+        elapsed = T.toc(output=True)
         if self.complete:
             self.finalize(verbose=verbose)
             sc.printv(f'Run finished after {elapsed:0.2f} s.\n', 1, verbose)
@@ -321,10 +321,14 @@ class Sim:
             # otherwise the scale factor will be applied multiple times
             raise AlreadyRunError('Simulation has already been finalized')
 
-        # Scale the results
+        # Scale the results, in place where the dtype is unchanged
+        scale = self.pars.pop_scale
         for reskey, res in self.results.items():
             if isinstance(res, ss.Result) and res.scale:
-                self.results[reskey] = self.results[reskey] * self.pars.pop_scale
+                if np.result_type(res, scale) == res.dtype:
+                    res *= scale
+                else:
+                    self.results[reskey] = res * scale
 
         for module in self.modules:
             module.finalize()
@@ -344,27 +348,12 @@ class Sim:
         Returns the last entry for count and cumulative results, and the mean otherwise
         """
         
-        def get_func(key, how, default='mean'):
-            """
-            Find the right function by matching the "how" key with the result key
-            
-            For example, hkey="cum_ " will match result key "cum_infections"
-            """
-            func = None
-            for hkey,hfunc in how.items():
-                if hkey in key:
-                    func = hfunc
-                    break
-            if func is None:
-                func = default
-            return func
-            
-        def get_result(res, func):
+        def get_reducer(func):
             """ Convert a string to the actual function to use, e.g. "median" maps to np.median() """
-            if   func == 'mean':   return res.mean()
-            elif func == 'median': return np.median(res)
-            elif func == 'last':   return res[-1]
-            elif callable(func):   return func(res)
+            if   func == 'mean':   return lambda res: res.mean()
+            elif func == 'median': return np.median
+            elif func == 'last':   return lambda res: res[-1]
+            elif callable(func):   return func
             else: raise Exception(f'"{func}" is not a valid function')
         
         # Convert "how" from a string to a dict
@@ -373,12 +362,18 @@ class Sim:
         elif isinstance(how, str):
             how = {'':how} # Match everything
         
+        # Resolve the functions once, and compile the keys into a single pattern of lookaheads; these are
+        # tried in order, so the first matching key in "how" wins, e.g. "cum_" matches "cum_infections"
+        default = get_reducer('mean')
+        reducers = [get_reducer(hfunc) for hfunc in how.values()]
+        pattern = re.compile('|'.join(f'(?=.*?({re.escape(hkey)}))' for hkey in how.keys()))
+        
         summary = sc.objdict()
-        flat = sc.flattendict(self.results, sep='_')
-        for key, res in flat.items():
+        for key, res in _flatten_results(self.results, sep='_'):
+            match = pattern.match(key)
+            reducer = reducers[match.lastindex-1] if match and match.lastindex else default
             try:
-                func = get_func(key, how)
-                entry = get_result(res, func)
+                entry = reducer(res)
             except Exception as E:
                 entry = f'N/A {E}'
             summary[key] = entry
@@ -404,7 +399,7 @@ class Sim:
         Returns:
             shrunken (Sim): a Sim object with the listed attributes removed
         """
-        # By default, skip people (~90% of memory), popdict, and _orig_pars (which is just a backup)
+        # By default, skip people (~90% of memory)
         if skip_attrs is None:
             skip_attrs = ['people']
 
@@ -415,7 +410,10 @@ class Sim:
                 setattr(self, attr, None)
         else:
             shrunken = object.__new__(self.__class__)
-            shrunken.__dict__ = {k: (v if k not in skip_attrs else None) for k, v in self.__dict__.items()}
+            shrunken.__dict__ = self.__dict__.copy() # Shallow copy at C speed, then blank out the skipped attributes
+            for attr in skip_attrs:
+                if attr in shrunken.__dict__:
+                    shrunken.__dict__[attr] = None
 
         # Don't return if in place
         if in_place:
@@ -548,29 +546,30 @@ class Sim:
             errormsg = 'Please run the sim before exporting the results'
             raise RuntimeError(errormsg)
 
-        def flatten_results(d, prefix=''):
-            flat = {}
-            for key, val in d.items():
-                if isinstance(val, dict):
-                    flat.update(flatten_results(val, prefix=prefix+key+'.'))
-                else:
-                    flat[prefix+key] = val
-            return flat
-
-        resdict = flatten_results(self.results)
-        resdict['t'] = self.yearvec
+        resdict = dict(_flatten_results(self.results, sep='.'))
 
-        df = sc.dataframe.from_dict(resdict).set_index('t')
+        # If all columns share a dtype, fill a single 2D array so the dataframe is built from one block
+        cols = list(resdict.values())
+        dtypes = {np.asarray(col).dtype for col in cols}
+        if len(dtypes) == 1 and all(np.ndim(col) == 1 and len(col) == len(self.yearvec) for col in cols):
+            arr = np.empty((len(self.yearvec), len(cols)), dtype=dtypes.pop())
+            for i, col in enumerate(cols):
+                arr[:, i] = col
+            df = sc.dataframe(arr, index=self.yearvec, columns=list(resdict.keys()))
+        else:
+            df = sc.dataframe(resdict, index=self.yearvec) # Construct with the index directly rather than via set_index()
+        df.index.name = 't'
         return df
 
-    def save(self, filename=None, keep_people=None, skip_attrs=None, **kwargs):
+    def save(self, filename=None, keep_people=None, skip_attrs=None, compression='zstd', **kwargs):
         """
-        Save to disk as a gzipped pickle.
+        Save to disk as a compressed pickle.
 
         Args:
             filename (str or None): the name or path of the file to save to; if None, uses stored
             keep_people (bool or None): whether to keep the people
             skip_attrs (list): attributes to skip saving
+            compression (str): type of compression, passed to sc.save(); 'zstd' (default, much faster for large arrays), 'gzip', or 'none'
             kwargs: passed to sc.makefilepath()
 
         Returns:
@@ -599,13 +598,13 @@ class Sim:
             obj = self.shrink(skip_attrs=skip_attrs, in_place=False)
         else:
             obj = self
-        sc.save(filename=filename, obj=obj)
+        sc.save(filename=filename, obj=obj, compression=compression)
 
         return filename
 
     @staticmethod
     def load(filename, *args, **kwargs):
-        """ Load from disk from a gzipped pickle.  """
+        """ Load from disk from a compressed pickle (the compression type is detected automatically) """
 
         sim = sc.load(filename, *args, **kwargs)
         if not isinstance(sim, Sim):  # pragma: no cover
@@ -689,12 +688,12 @@ class Sim:
                 d['parameters'] = pardict
             elif key == 'summary':
                 if self.results_ready:
-                    d['summary'] = dict(sc.dcp(self.summary))
+                    d['summary'] = dict(self.summary)
                 else:
                     d['summary'] = 'Summary not available (Sim has not yet been run)'
             elif key == 'short_summary':
                 if self.results_ready:
-                    d['short_summary'] = dict(sc.dcp(self.short_summary))
+                    d['short_summary'] = dict(self.short_summary)
                 else:
                     d['short_summary'] = 'Full summary not available (Sim has not yet been run)'
             else:  # pragma: no cover
@@ -781,6 +780,16 @@ class AlreadyRunError(RuntimeError):
     pass
 
 
+def _flatten_results(d, sep, prefix=''):
+    """ Yield the flattened keys and results in order, equivalent to sc.flattendict(d, sep=sep) """
+    for key, val in d.items():
+        fullkey = f'{prefix}{sep}{key}' if prefix else key
+        if isinstance(val, dict):
+            yield from _flatten_results(val, sep, fullkey)
+        else:
+            yield fullkey, val
+
+
 def demo(run=True, plot=True, summary=True, show=True, **kwargs):
     """
     Create a simple demo simulation for Starsim
@@ -857,80 +866,54 @@ def diff_sims(sim1, sim2, skip_key_diffs=False, skip=None, full=False, output=Fa
         if extra:
             keymatchmsg += f'  Extra sim2 keys: {extra}\n'
 
-    # Compare values
+    # Compare values, all at once
     valmatchmsg = ''
-    mismatches = {}
-    n_mismatch = 0
     skip = sc.tolist(skip)
-    for key in sim2.keys():  # To ensure order
-        if key in sim1_keys and key not in skip:  # If a key is missing, don't count it as a mismatch
-            sim1_val = sim1[key] if key in sim1 else 'not present'
-            sim2_val = sim2[key] if key in sim2 else 'not present'
-            mm = not np.isclose(sim1_val, sim2_val, equal_nan=True)
-            n_mismatch += mm
-            if mm or full:
-                mismatches[key] = {'sim1': sim1_val, 'sim2': sim2_val}
+    keys = [key for key in sim2.keys() if key in sim1_keys and key not in skip] # To ensure order; if a key is missing, don't count it as a mismatch
+    vals1 = np.array([sim1[key] for key in keys], dtype=float)
+    vals2 = np.array([sim2[key] for key in keys], dtype=float)
+    mm = ~np.isclose(vals1, vals2, equal_nan=True)
+    n_mismatch = np.count_nonzero(mm)
+    show = mm | full
+    mismatches = {key: {'sim1': sim1[key], 'sim2': sim2[key]} for key, s in zip(keys, show) if s}
 
     if len(mismatches):
         valmatchmsg = '\nThe following values differ between the two simulations:\n' if not full else ''
         df = sc.dataframe.from_dict(mismatches).transpose()
-        diff = []
-        ratio = []
-        change = []
+        old = vals1[show]
+        new = vals2[show]
         small_change = 1e-3  # Define a small change, e.g. a rounding error
-        for mdict in mismatches.values():
-            old = mdict['sim1']
-            new = mdict['sim2']
-            numeric = sc.isnumber(sim1_val) and sc.isnumber(sim2_val)
-            if numeric and old > 0:
-                this_diff = new - old
-                this_ratio = new / old
-                abs_ratio = max(this_ratio, 1.0 / this_ratio)
-
-                # Set the character to use
-                if abs_ratio < small_change:
-                    change_char = '≈'
-                elif new > old:
-                    change_char = '↑'
-                elif new < old:
-                    change_char = '↓'
-                elif new == old:
-                    change_char = '='
-                else:
-                    errormsg = f'Could not determine relationship between sim1={old} and sim2={new}'
-                    raise ValueError(errormsg)
-
-                # Set how many repeats it should have
-                repeats = 1
-                if abs_ratio == 0:
-                    repeats = 0
-                if abs_ratio >= 1.1:
-                    repeats = 2
-                if abs_ratio >= 2:
-                    repeats = 3
-                if abs_ratio >= 10:
-                    repeats = 4
-
-                this_change = change_char * repeats
-            else:  # pragma: no cover
-                this_diff = np.nan
-                this_ratio = np.nan
-                this_change = 'N/A'
-
-            diff.append(this_diff)
-            ratio.append(this_ratio)
-            change.append(this_change)
+        
+        # Calculate the differences and ratios; only defined for positive reference values
+        valid = old > 0
+        with np.errstate(divide='ignore', invalid='ignore'):
+            diff = np.where(valid, new - old, np.nan)
+            ratio = np.where(valid, new / old, np.nan)
+            abs_ratio = np.maximum(ratio, 1.0 / ratio)
+        
+        # Set the character to use
+        change_char = np.select([abs_ratio < small_change, new > old, new < old, new == old], ['≈', '↑', '↓', '='], default='')
+        invalid = valid & (change_char == '')
+        if invalid.any():
+            i = np.flatnonzero(invalid)[0]
+            errormsg = f'Could not determine relationship between sim1={old[i]} and sim2={new[i]}'
+            raise ValueError(errormsg)
+        
+        # Set how many repeats it should have
+        repeats = np.select([abs_ratio >= 10, abs_ratio >= 2, abs_ratio >= 1.1, abs_ratio == 0], [4, 3, 2, 0], default=1)
+        change = [c*r if v else 'N/A' for c, r, v in zip(change_char.tolist(), repeats.tolist(), valid)]
 
         df['diff'] = diff
         df['ratio'] = ratio
         for col in ['sim1', 'sim2', 'diff', 'ratio']:
             df[col] = df[col].round(decimals=3)
         df['change'] = change
-        valmatchmsg += str(df)
+        if die or not output: # Formatting the dataframe is slow, so skip it if it's only being returned
+            valmatchmsg += str(df)
 
     # Raise an error if mismatches were found
     mismatchmsg = keymatchmsg + valmatchmsg
-    if mismatchmsg:  # pragma: no cover
+    if keymatchmsg or len(mismatches):  # pragma: no cover
         if die and n_mismatch: # To catch full=True case
             raise ValueError(mismatchmsg)
         elif output:
@@ -3,6 +3,7 @@ Define array-handling classes, including agent states
 """
 
 import numpy as np
+import numba as nb
 import starsim as ss
 
 # Shorten these for performance
@@ -12,6 +13,96 @@ ss_bool  = ss.dtypes.bool
 
 __all__ = ['check_dtype', 'Arr', 'FloatArr', 'BoolArr', 'IndexArr', 'uids']
 
+# Supported dtype aliases, for a single lookup in check_dtype()
+_float_aliases = ['float', float, np.float64, np.float32]
+_int_aliases   = ['int', int, np.int64, np.int32]
+_bool_aliases  = ['bool', bool, np.bool_]
+_dtype_map = {alias:dtype for aliases,dtype in [(_float_aliases, ss_float), (_int_aliases, ss_int), (_bool_aliases, ss_bool)] for alias in aliases}
+
+
+@nb.njit(cache=True)
+def _trim(out, n):  # pragma: no cover
+    """ Return the first n entries of an output buffer, copying them if most of the buffer is unused so it isn't kept alive """
+    if n < len(out)//2:
+        return out[:n].copy()
+    return out[:n]
+
+
+@nb.njit(cache=True)
+def _notnan_vals(raw, auids):  # pragma: no cover
+    """ Gather the non-NaN values of the active agents in a single pass; used by FloatArr.notnanvals """
+    out = np.empty(len(auids), dtype=raw.dtype)
+    n = 0
+    for i in range(len(auids)):
+        val = raw[auids[i]]
+        if not np.isnan(val):
+            out[n] = val
+            n += 1
+    return _trim(out, n)
+
+
+@nb.njit(cache=True)
+def _is_increasing(arr, strict):  # pragma: no cover
+    """ Check whether an array is sorted in increasing order (strictly, i.e. also unique, if strict is True) """
+    for i in range(1, len(arr)):
+        if arr[i] < arr[i-1] or (strict and arr[i] == arr[i-1]):
+            return False
+    return True
+
+
+@nb.njit(cache=True)
+def _sorted_setop(a, b, keep):  # pragma: no cover
+    """
+    Keep the entries of a that are (if keep is True) or are not (if False) in b,
+    for uids.intersect() and uids.remove(). Since a must be sorted and unique,
+    the result matches np.intersect1d()/np.setdiff1d(), without their sorting.
+    Uses a merge if b is also sorted, else a hash set of b.
+    """
+    out = np.empty(len(a), dtype=a.dtype)
+    n = 0
+    if _is_increasing(b, False):
+        j = 0
+        for i in range(len(a)):
+            val = a[i]
+            while j < len(b) and b[j] < val:
+                j += 1
+            if (j < len(b) and b[j] == val) == keep:
+                out[n] = val
+                n += 1
+    else:
+        bset = set(b)
+        for i in range(len(a)):
+            val = a[i]
+            if (val in bset) == keep:
+                out[n] = val
+                n += 1
+    return _trim(out, n)
+
+
+@nb.njit(cache=True)
+def _count_true(raw, auids):  # pragma: no cover
+    """ Count the active agents with truthy values, without gathering them first; used by Arr.count() """
+    n = 0
+    for i in range(len(auids)):
+        n += raw[auids[i]] != 0
+    return n
+
+
+@nb.njit(cache=True)
+def _true_uids(raw, auids, want):  # pragma: no cover
+    """
+    Return the active UIDs whose values are truthy (if want is True) or falsy (if
+    False), in one pass; used by Arr.true() and Arr.false(). The count is updated
+    without a branch, which is much faster than branching on unpredictable values.
+    """
+    out = np.empty(len(auids), dtype=auids.dtype)
+    n = 0
+    for i in range(len(auids)):
+        uid = auids[i]
+        out[n] = uid
+        n += (raw[uid] != 0) == want
+    return _trim(out, n)
+
 
 def check_dtype(dtype, default=None):
     """ Check that the supplied dtype is one of the supported options """
@@ -24,11 +115,16 @@ def check_dtype(dtype, default=None):
         else:
             dtype = type(default)
     
-    if dtype in ['float', float, np.float64, np.float32]:
+    try:
+        return _dtype_map[dtype]
+    except (KeyError, TypeError): # Fall back to equality checks, e.g. for np.dtype instances
+        pass
+    
+    if dtype in _float_aliases:
         dtype = ss_float
-    elif dtype in ['int', int, np.int64, np.int32]:
+    elif dtype in _int_aliases:
         dtype = ss_int
-    elif dtype in ['bool', bool, np.bool_]:
+    elif dtype in _bool_aliases:
         dtype = ss_bool
     else:
         warnmsg = f'Data type {type(default)} not a supported data type; set warn=False to suppress warning'
@@ -133,11 +229,17 @@ class Arr(np.lib.mixins.NDArrayOperatorsMixin):
             raise Exception(errormsg)
     
     def __getitem__(self, key):
-        key = self._convert_key(key)
+        if type(key) is not uids: # UIDs are by far the most common key and index raw directly, so skip the conversion
+            key = self._convert_key(key)
         return self.raw[key]
     
     def __setitem__(self, key, value):
-        key = self._convert_key(key)
+        key_type = type(key)
+        if key_type is not uids:
+            if key_type is slice and self._contiguous(): # Write through a view rather than converting the slice to UIDs
+                self.raw[:self.len_used][key] = value
+                return
+            key = self._convert_key(key)
         self.raw[key] = value
         return
             
@@ -148,18 +250,40 @@ class Arr(np.lib.mixins.NDArrayOperatorsMixin):
         else:
             return getattr(self.values, attr)
         
-    def __gt__(self, other): return self.asnew(self.values > other,  cls=BoolArr)
-    def __lt__(self, other): return self.asnew(self.values < other,  cls=BoolArr)
-    def __ge__(self, other): return self.asnew(self.values >= other, cls=BoolArr)
-    def __le__(self, other): return self.asnew(self.values <= other, cls=BoolArr)
-    def __eq__(self, other): return self.asnew(self.values == other, cls=BoolArr)
-    def __ne__(self, other): return self.asnew(self.values != other, cls=BoolArr)
+    def __gt__(self, other): return self.asnew(self._active > other,  cls=BoolArr)
+    def __lt__(self, other): return self.asnew(self._active < other,  cls=BoolArr)
+    def __ge__(self, other): return self.asnew(self._active >= other, cls=BoolArr)
+    def __le__(self, other): return self.asnew(self._active <= other, cls=BoolArr)
+    def __eq__(self, other): return self.asnew(self._active == other, cls=BoolArr)
+    def __ne__(self, other): return self.asnew(self._active != other, cls=BoolArr)
+    
+    # Common reductions, defined explicitly so they use the active values without a copy where possible, rather than going via __getattr__
+    def sum(self, *args, **kwargs):  return self._active.sum(*args, **kwargs)
+    def mean(self, *args, **kwargs): return self._active.mean(*args, **kwargs)
+    def std(self, *args, **kwargs):  return self._active.std(*args, **kwargs)
+    def min(self, *args, **kwargs):  return self._active.min(*args, **kwargs)
+    def max(self, *args, **kwargs):  return self._active.max(*args, **kwargs)
+    def any(self, *args, **kwargs):  return self._active.any(*args, **kwargs)
+    def all(self, *args, **kwargs):  return self._active.all(*args, **kwargs)
+    
+    # Array metadata, which doesn't need the values at all
+    @property
+    def shape(self): return (len(self),)
+    @property
+    def size(self): return len(self)
+    @property
+    def ndim(self): return 1
     
     def __and__(self, other): raise BooleanOperationError(self)
     def __or__(self, other):  raise BooleanOperationError(self)
     def __xor__(self, other): raise BooleanOperationError(self)
     def __invert__(self):     raise BooleanOperationError(self)
 
+    def __array__(self, dtype=None, copy=None):
+        """ Convert to a plain array of the active values, e.g. for np.asarray(); this is always a new array, not a view of raw """
+        vals = self.values
+        return vals if dtype is None else vals.astype(dtype, copy=False)
+
     def __array_ufunc__(self, *args, **kwargs):
         if args[1] != '__call__':
             # This is a catch-all for ufuncs that are not being applied with '__call__' (e.g., operations returning a scalar like 'np.sum()' use reduce instead)
@@ -167,7 +291,7 @@ class Arr(np.lib.mixins.NDArrayOperatorsMixin):
             kwargs = {k: v if v is not self else self.values for k, v in kwargs.items()}
             return self.values.__array_ufunc__(*args, **kwargs)
         else:
-            args = [(x if x is not self else self.values) for x in args] # Convert any operands that are Arr instances to their value arrays
+            args = [(x if x is not self else self._active) for x in args] # Convert any operands that are Arr instances to their value arrays; the ufunc output is a new array
             if 'out' in kwargs and kwargs['out'][0] is self:
                 # In-place operations like += applied to the entire Arr instance
                 # use this branch. Therefore, we perform our computation on a new
@@ -183,20 +307,41 @@ class Arr(np.lib.mixins.NDArrayOperatorsMixin):
     @property
     def auids(self):
         """ Link to the indices of active agents -- sim.people.auids """
-        try:
-            return self.people.auids
-        except:
+        people = self.people
+        if people is not None: # Checked directly, rather than relying on an exception, since this is called on almost every operation
+            return people.auids
+        else:
             if not self.initialized:
                 ss.warn('Trying to access non-initialized Arr object; in most cases, Arr objects need to be initialized with a Sim object, but set skip_init=True if this is intentional.')
-            return uids(np.arange(len(self.raw)))
+            return np.arange(len(self.raw), dtype=ss_int).view(uids)
     
     def count(self):
-        return np.count_nonzero(self.values)
+        if self._contiguous():
+            return np.count_nonzero(self.raw[:self.len_used]) # SIMD count on the contiguous buffer
+        return _count_true(self.raw, self.auids)
 
     @property
     def values(self):
         """ Return the values of the active agents """
         return self.raw[self.auids]
+    
+    def _contiguous(self):
+        """ Whether the active agents are exactly the first len_used entries, e.g. if no agents have been removed """
+        auids = self.auids
+        n = len(auids)
+        return n == self.len_used and (n == 0 or auids[-1] == n-1) # auids is sorted and unique, so this means auids == arange(n)
+    
+    @property
+    def _active(self):
+        """
+        Like Arr.values, but return a view of raw (with no copy) if the active agents
+        are contiguous. Only for internal use where the result is consumed immediately
+        and not modified, since it may share memory with raw.
+        """
+        if self._contiguous():
+            return self.raw[:self.len_used]
+        else:
+            return self.raw[self.auids]
 
     def set(self, uids, new_vals=None):
         """ Set the values for the specified UIDs"""
@@ -219,11 +364,11 @@ class Arr(np.lib.mixins.NDArrayOperatorsMixin):
 
     @property
     def isnan(self):
-        return self.asnew(self.values == self.nan, cls=BoolArr)
+        return self.asnew(self._active == self.nan, cls=BoolArr)
 
     @property
     def notnan(self):
-        return self.asnew(self.values != self.nan, cls=BoolArr)
+        return self.asnew(self._active != self.nan, cls=BoolArr)
 
     def grow(self, new_uids=None, new_vals=None):
         """
@@ -242,12 +387,11 @@ class Arr(np.lib.mixins.NDArrayOperatorsMixin):
         # Physically reshape the arrays, if needed
         if orig_len + n_new > self.len_tot:
             n_grow = max(n_new, self.len_tot//2)  # Minimum 50% growth, since growing arrays is slow
-            new_empty = np.empty(n_grow, dtype=self.dtype) # 10x faster than np.zeros()
-            self.raw = np.concatenate([self.raw, new_empty], axis=0)
+            new_raw = np.empty(self.len_tot + n_grow, dtype=self.dtype).view(type(self.raw)) # 10x faster than np.zeros(); keep the array subclass, e.g. uids for IndexArr
+            new_raw[:self.len_tot] = self.raw
+            new_raw[self.len_used:] = self.nan # Set any extra space at the end to NaN, via a slice rather than UIDs
+            self.raw = new_raw
             self.len_tot = len(self.raw)
-            if n_grow > n_new: # We added extra space at the end, set to NaN
-                nan_uids = np.arange(self.len_used, self.len_tot)
-                self.set_nan(nan_uids)
         
         # Set new values, and NaN if needed
         self.set(new_uids, new_vals=new_vals) # Assign new default values to those agents
@@ -273,22 +417,25 @@ class Arr(np.lib.mixins.NDArrayOperatorsMixin):
         if cls is None:
             cls = self.__class__
         if arr is None:
-            arr = self.values
+            arr = self._active # Copied into the new array below
         new = object.__new__(cls) # Create a new Arr instance
         new.__dict__ = self.__dict__.copy() # Copy pointers
         new.dtype = arr.dtype # Set to correct dtype
         new.name = name # In most cases, the asnew Arr has different values to the original Arr so the original name no longer makes sense
         new.raw = np.empty(new.raw.shape, dtype=new.dtype) # Copy values, breaking reference
-        new.raw[new.auids] = arr
+        if self._contiguous():
+            new.raw[:self.len_used] = arr # Contiguous copy rather than a scatter
+        else:
+            new.raw[new.auids] = arr
         return new
 
     def true(self):
         """ Efficiently convert truthy values to UIDs """
-        return self.auids[self.values.astype(bool)]
+        return _true_uids(self.raw, self.auids, True).view(uids)
 
     def false(self):
         """ Reverse of true(); return UIDs of falsy values """
-        return self.auids[~self.values.astype(bool)]
+        return _true_uids(self.raw, self.auids, False).view(uids)
 
 
 class FloatArr(Arr):
@@ -306,19 +453,18 @@ class FloatArr(Arr):
     @property
     def isnan(self):
         """ Return BoolArr for NaN values """
-        return self.asnew(np.isnan(self.values), cls=BoolArr)
+        return self.asnew(np.isnan(self._active), cls=BoolArr)
 
     @property
     def notnan(self):
         """ Return BoolArr for non-NaN values """
-        return self.asnew(~np.isnan(self.values), cls=BoolArr)
+        mask = np.isnan(self._active)
+        return self.asnew(np.logical_not(mask, out=mask), cls=BoolArr) # Invert in place rather than allocating a second mask
     
     @property
     def notnanvals(self):
         """ Return values that are not-NaN """
-        vals = self.values # Shorten and avoid double indexing
-        out = vals[np.nonzero(~np.isnan(vals))[0]]
-        return out
+        return _notnan_vals(self.raw, self.auids)
 
 
 class BoolArr(Arr):
@@ -327,10 +473,10 @@ class BoolArr(Arr):
         super().__init__(name=name, dtype=ss_bool, nan=nan, coerce=False, **kwargs)
         return
     
-    def __and__(self, other): return self.asnew(self.values & other)
-    def __or__(self, other):  return self.asnew(self.values | other)
-    def __xor__(self, other): return self.asnew(self.values ^ other)
-    def __invert__(self):     return self.asnew(~self.values)
+    def __and__(self, other): return self.asnew(self._active & other)
+    def __or__(self, other):  return self.asnew(self._active | other)
+    def __xor__(self, other): return self.asnew(self._active ^ other)
+    def __invert__(self):     return self.asnew(~self._active)
 
     # BoolArr cannot store NaNs so report all entries as being not-NaN
     @property
@@ -370,8 +516,7 @@ class IndexArr(Arr):
         """ Change the size of the array """
         if new_uids is None and new_vals is not None: # Used as a shortcut to avoid needing to supply twice
             new_uids = new_vals
-        super().grow(new_uids=new_uids, new_vals=new_vals)
-        self.raw = uids(self.raw)
+        super().grow(new_uids=new_uids, new_vals=new_vals) # Arr.grow() preserves the uids type of raw
         return
     
     
@@ -385,7 +530,7 @@ class uids(np.ndarray):
     UID operations.    
     """
     def __new__(cls, arr=None):
-        if isinstance(arr, np.ndarray): # Shortcut to typical use case, where the input is an array
+        if isinstance(arr, np.ndarray): # Shortcut to typical use case, where the input is an array; this always copies, so use arr.view(ss.uids) for a new temporary array
             return arr.astype(ss_int).view(cls)
         elif isinstance(arr, BoolArr): # Shortcut for arr.uids
             return arr.uids
@@ -407,16 +552,31 @@ class uids(np.ndarray):
         arrs = args[0] if len(args) == 1 else args
         return np.concatenate(arrs, **kw).view(cls)
 
+    def _sorted_setop(self, other, keep):
+        """ Fast path for remove() and intersect() if self is sorted and unique, as UIDs usually are; else return None """
+        other = np.asarray(other)
+        if self.ndim != 1 or other.ndim != 1 or other.dtype.kind not in 'iu' or not _is_increasing(self, True):
+            return None
+        return _sorted_setop(self, other.astype(self.dtype, copy=False), keep).view(self.__class__)
+
     def remove(self, other, **kw):
         """ Remove provided UIDs from current array"""
         if isinstance(other, BoolArr):
             other = other.uids
+        if not kw:
+            out = self._sorted_setop(other, keep=False)
+            if out is not None:
+                return out
         return np.setdiff1d(self, other, **kw).view(self.__class__)
 
     def intersect(self, other, **kw):
         """ Keep only UIDs that are also present in the other array """
         if isinstance(other, BoolArr):
             other = other.uids
+        if not kw:
+            out = self._sorted_setop(other, keep=True)
+            if out is not None:
+                return out
         return np.intersect1d(self, other, **kw).view(self.__class__)
 
     def union(self, other, **kw):
@@ -107,8 +107,13 @@ class ndict(sc.objdict):
         return
 
     def copy(self):
-        new = self.__class__.__new__(nameattr=self._nameattr, type=self._type, strict=self._strict)
-        new.update(self)
+        """ Shallow copy, keeping the ndict settings; entries are not revalidated """
+        new = self.__class__.__new__(self.__class__)
+        new.setattribute('_nameattr', self._nameattr)
+        new.setattribute('_type', self._type)
+        new.setattribute('_strict', self._strict)
+        new.setattribute('_overwrite', self._overwrite)
+        dict.update(new, self)
         return new
 
     def __add__(self, dict2):
@@ -165,28 +170,92 @@ def unique(arr):
     Equivalent to np.unique(return_counts=True) but ~5x faster, and
     only works for arrays of positive integers.
     """
-    counts = np.bincount(arr.ravel())
-    unique = np.flatnonzero(counts)
-    counts = counts[unique]
-    return unique, counts
-
-@nb.njit
-def find_contacts(p1, p2, inds):  # pragma: no cover
+    arr = np.asarray(arr).ravel()
+    if not arr.size or arr.dtype.kind not in 'iu': # Fall back to the original implementation, which also handles errors
+        counts = np.bincount(arr)
+        unique = np.flatnonzero(counts)
+        counts = counts[unique]
+        return unique, counts
+    hi = int(arr.max())
+    if hi > 10*arr.size: # Counting is wasteful if the values are sparse, so sort instead
+        if arr.min() < 0:
+            raise ValueError('Array values must be non-negative')
+        unique, counts = np.unique(arr, return_counts=True)
+        return unique.astype(np.int64, copy=False), counts.astype(np.int64, copy=False)
+    return _unique_counts(arr, hi)
+
+
+@nb.njit(cache=True)
+def _unique_counts(arr, hi):  # pragma: no cover
+    """ Count occurrences and compact them into unique values and counts in a single pass over the counts """
+    counts = np.zeros(hi+1, dtype=np.int64)
+    for x in arr:
+        if x < 0:
+            raise ValueError('Array values must be non-negative')
+        counts[x] += 1
+    n = 0
+    for v in counts:
+        if v:
+            n += 1
+    unique = np.empty(n, dtype=np.int64)
+    out = np.empty(n, dtype=np.int64)
+    j = 0
+    for i in range(len(counts)):
+        v = counts[i]
+        if v:
+            unique[j] = i
+            out[j] = v
+            j += 1
+    return unique, out
+
+
+def find_contacts(p1, p2, inds, as_array=False):
     """
     Variation on Network.find_contacts() that avoids sorting.
 
     A set is returned here rather than a sorted array so that custom tracing interventions can efficiently
-    add extra people. For a version with sorting by default, see Network.find_contacts(). Indices must be
-    an int64 array since this is what's returned by true() etc. functions by default.
+    add extra people. For a version with sorting by default, see Network.find_contacts(). Indices are
+    converted to an int64 array since this is what's returned by true() etc. functions by default.
+
+    Args:
+        p1 (array): first person in each edge
+        p2 (array): second person in each edge
+        inds (array): indices of people whose contacts to return
+        as_array (bool): if true, return an unsorted array of unique indices instead of a set
     """
-    pairing_partners = set()
-    inds = set(inds)
+    p1 = np.asarray(p1)
+    p2 = np.asarray(p2)
+    inds = np.asarray(inds, dtype=np.int64)
+    if min(p1.min(initial=0), p2.min(initial=0), inds.min(initial=0)) < 0:
+        raise ValueError('Indices must be non-negative')
+    n_people = int(max(p1.max(initial=-1), p2.max(initial=-1), inds.max(initial=-1))) + 1 # Size of the lookup arrays; computed here so the kernel can skip bounds checks
+    contacts = _find_contacts(p1, p2, inds, n_people)
+    if as_array:
+        return contacts
+    return set(contacts.tolist())
+
+
+@nb.njit(cache=True, boundscheck=False)
+def _find_contacts(p1, p2, inds, n_people):  # pragma: no cover
+    """ Find the unique contacts of the specified people, using lookup arrays instead of sets """
+    is_ind = np.zeros(n_people, dtype=np.bool_)
+    for i in inds:
+        is_ind[i] = True
+    found = np.zeros(n_people, dtype=np.bool_)
+    out = np.empty(min(2*len(p1), n_people), dtype=np.int64)
+    k = 0
     for i in range(len(p1)):
-        if p1[i] in inds:
-            pairing_partners.add(p2[i])
-        if p2[i] in inds:
-            pairing_partners.add(p1[i])
-    return pairing_partners
+        a = p1[i]
+        b = p2[i]
+        if is_ind[a] and not found[b]:
+            found[b] = True
+            out[k] = b
+            k += 1
+        if is_ind[b] and not found[a]:
+            found[a] = True
+            out[k] = a
+            k += 1
+    return out[:k]
 
 
 # %% Seed methods
@@ -202,26 +271,24 @@ def set_seed(seed=None):
     Args:
         seed (int): the random seed
     '''
-
-    @nb.njit(cache=True)
-    def set_seed_numba(seed):
-        return np.random.seed(seed)
-
-    def set_seed_regular(seed):
-        return np.random.seed(seed)
-
     # Dies if a float is given
     if seed is not None:
         seed = int(seed)
 
-    set_seed_regular(seed)  # If None, reinitializes it
+    np.random.seed(seed)  # If None, reinitializes it
     if seed is None:  # Numba can't accept a None seed, so use our just-reinitialized Numpy stream to generate one
         seed = np.random.randint(1e9)
-    set_seed_numba(seed)
+    _set_seed_numba(seed)
 
     return
 
 
+@nb.njit(cache=True)
+def _set_seed_numba(seed):  # pragma: no cover
+    """ Numba has its own random state, which can only be reset from compiled code """
+    return np.random.seed(seed)
+
+
 # %% Data cleaning and processing
 
 __all__ += ['standardize_data']
@@ -317,6 +384,9 @@ def standardize_data(data=None, metadata=None, min_year=1800, out_of_range=0, de
     return output
 
 
+_u64_scale = 1.0/np.iinfo(np.uint64).max # Rounds to exactly 2**-64, so multiplying by it gives the same result as dividing by the max
+
+
 def combine_rands(a, b):
     """
     Efficient algorithm for combining two arrays of random numbers into one
@@ -328,6 +398,18 @@ def combine_rands(a, b):
     Returns:
         A new array of random numbers the same size as a and b
     """
-    c = np.bitwise_xor(a*b, a-b)
-    u = c / np.iinfo(np.uint64).max
-    return u
+    if a.shape != b.shape or a.dtype != b.dtype: # Leave broadcasting and type promotion to NumPy
+        c = np.bitwise_xor(a*b, a-b)
+        u = c * _u64_scale
+        return u
+    out = np.empty(a.shape, dtype=np.float64)
+    _combine_rands(a.ravel(), b.ravel(), out.ravel(), _u64_scale)
+    return out
+
+
+@nb.njit(cache=True)
+def _combine_rands(a, b, out, scale):  # pragma: no cover
+    """ Single-pass version of combine_rands(), writing into out; gives identical results to the NumPy version """
+    for i in range(len(a)):
+        out[i] = ((a[i]*b[i]) ^ (a[i]-b[i])) * scale
+    return
@@ -191,6 +191,25 @@ def test_null():
     return sim
 
 
+def test_find_contacts():
+    sc.heading('Testing finding contacts...')
+    sim = ss.Sim(n_agents=small, networks='random')
+    sim.initialize()
+    nw = sim.networks[0]
+    inds = [1, 3, 5]
+
+    # Compare against a brute-force search over the edges
+    p1 = np.array(nw.edges.p1)
+    p2 = np.array(nw.edges.p2)
+    expected = set(p2[np.isin(p1, inds)].tolist()) | set(p1[np.isin(p2, inds)].tolist())
+    contacts = nw.find_contacts(inds)
+    assert np.array_equal(contacts, sorted(expected))
+    assert nw.find_contacts(inds, as_array=False) == expected
+    assert ss.find_contacts(nw.edges.p1, nw.edges.p2, inds) == expected
+    assert set(ss.find_contacts(nw.edges.p1, nw.edges.p2, np.array(inds), as_array=True).tolist()) == expected
+    return contacts
+
+
 
 # %% Run as a script
 if __name__ == '__main__':
@@ -205,5 +224,6 @@ if __name__ == '__main__':
     erdo = test_erdosrenyi()
     disk = test_disk()
     null = test_null()
+    cont = test_find_contacts()
 
     T.toc()
\ No newline at end of file
@@ -7,6 +7,7 @@ import sciris as sc
 import numpy as np
 import starsim as ss
 import matplotlib.pyplot as pl
+import pytest
 
 sc.options(interactive=False) # Assume not running interactively
 
@@ -110,6 +111,12 @@ def test_arrs():
     assert np.array_equal(~s1.people.female, s1.people.male), 'Definition of men does not match'
     assert isinstance(s1.people.age < 5, ss.BoolArr), 'Performing logical operations should return a BoolArr'
     
+    # Test exporting people to a dataframe
+    df = s1.people.to_df()
+    assert len(df) == len(s1.people), 'Dataframe should have one row per active agent'
+    assert np.array_equal(df['age'], s1.people.age.values), 'Dataframe ages should match the active agents'
+    assert np.array_equal(df['uid'], s1.people.auids), 'Dataframe UIDs should match the active agents'
+    
     o.s1 = s1
     o.s2 = s2   
     
@@ -151,6 +158,44 @@ def test_deepcopy_until():
     return s1, s2
 
 
+def test_ndict():
+    sc.heading('Testing ndict copying and adding')
+    sir = ss.SIR()
+    sis = ss.SIS()
+    nd = ss.ndict(sir, type=ss.Disease)
+
+    # Copies keep their settings and entries, but are separate objects
+    nd2 = nd.copy()
+    assert isinstance(nd2, ss.ndict) and nd2 is not nd
+    assert nd2._type is ss.Disease and nd2.keys() == nd.keys() and nd2.sir is sir
+
+    # Adding uses a copy, leaving the original untouched
+    nd3 = nd + sis
+    assert nd3.keys() == ['sir', 'sis'] and nd.keys() == ['sir']
+    with pytest.raises(TypeError):
+        nd3 + ss.People(small) # Wrong type
+    return nd3
+
+
+def test_auids_snapshot():
+    sc.heading('Testing that saved active UIDs are not modified')
+    sim = ss.Sim(n_agents=small, diseases=dict(type='sir', p_death=0.5), networks='random', demographics=True)
+    sim.initialize()
+    saved = []
+    while not sim.complete:
+        auids = sim.people.auids
+        saved.append((auids, auids.copy()))
+        n_alive = len(auids)
+        sim.step()
+        if len(sim.people.auids) < n_alive: # Agents died on this step
+            break
+    else:
+        raise AssertionError('Expected some agents to die')
+    for auids, orig in saved:
+        assert np.array_equal(auids, orig), 'Active UIDs saved before a step should not change'
+    return saved
+
+
 
 # %% Run as a script
 if __name__ == '__main__':
@@ -167,6 +212,8 @@ if __name__ == '__main__':
     sims = test_arrs()
     sims2 = test_deepcopy()
     sims3 = test_deepcopy_until()
+    nd = test_ndict()
+    saved = test_auids_snapshot()
 
     sc.toc(T)
     pl.show()
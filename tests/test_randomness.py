@@ -84,6 +84,23 @@ def test_jump(n=n):
     return before, after
 
 
+def test_defer_jump(n=n):
+    """ A deferred jump followed by a draw matches a jump followed by a draw """
+    sc.heading('Testing deferred jumps')
+    eager = make_dists()
+    lazy = make_dists()
+    for dist in [*eager.dists.values(), *lazy.dists.values()]:
+        dist(n) # Advance the state so the jump has to reset it
+    
+    states = eager.jump(to=10)
+    lazy._defer_jump(to=10)
+    for e,l,state in zip(eager.dists.values(), lazy.dists.values(), states):
+        assert l.state == state, 'State after a deferred jump should match the jumped state'
+        assert np.array_equal(e(n), l(n)), 'Draws after a deferred jump should match those after a jump'
+        assert e.ind == l.ind
+    return states
+
+
 def test_order(n=n):
     """ Ensure sampling from one RNG doesn't affect another """
     sc.heading('Testing from multiple random number generators to test if sampling order matters')
@@ -307,6 +324,14 @@ def test_combine_rands(do_plot=False):
     assert np.isclose(mean, target, atol=atol), f'Expected value to be 0.5±{atol}, not {mean}'
     ks = sps.kstest(c, sps.uniform(0,1).cdf)
     assert ks.pvalue > 0.05, f'Distribution does not seem to be uniform, p={ks.pvalue}<0.05'
+    
+    # The compiled version must match the NumPy expression exactly, for any size and for signed inputs
+    for size in [0, 1, 999, 1000, 1001]:
+        for dtype in [np.uint64, np.int64]:
+            aa = a[:size].view(dtype)
+            bb = b[:size].view(dtype)
+            expected = np.bitwise_xor(aa*bb, aa-bb) * (1.0/np.iinfo(np.uint64).max)
+            assert np.array_equal(ss.combine_rands(aa, bb), expected)
     return c
 
 
@@ -318,6 +343,7 @@ if __name__ == '__main__':
     o1 = test_seed()
     o2 = test_reset(n)
     o3 = test_jump(n)
+    o3b = test_defer_jump(n)
     o4 = test_order(n)
     o5 = test_worlds(do_plot=do_plot)
     o6 = test_independence(do_plot=do_plot)